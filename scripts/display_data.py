@@ -1,6 +1,7 @@
 import polars as pl
 import argparse
 from src.utils import read_validators_data
+from src.gz_index import build_index, read_rows
 from src.logger import init_logger, logger
 
 # Initialize logger
@@ -35,13 +36,56 @@ def display_top_rows(n: int = 10) -> None:
         logger.error(f"Error reading data: {str(e)}")
         raise
 
+def display_rows(block: int | None = None, offset: int = 0, n: int = 10) -> None:
+    """
+    Display n rows starting at `offset` rows into `block` (or into the file),
+    using the seekable gzip index instead of decompressing everything before it.
+
+    Args:
+        block: Block number to start from, or None for the start of the file
+        offset: Number of rows to skip from the start of the block
+        n: Number of rows to display
+    """
+    try:
+        rows = read_rows(block=block, offset=offset, n=n)
+        where = f"block {block}" if block is not None else "file start"
+
+        print(f"\nData Preview ({where}, offset {offset}):")
+        print(pl.DataFrame(rows))
+
+    except Exception as e:
+        logger.error(f"Error reading data: {str(e)}")
+        raise
+
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Display top N rows of validator data")
+    parser = argparse.ArgumentParser(description="Display N rows of validator data")
     parser.add_argument(
         "-n", "--num-rows",
         type=int,
         default=10,
         help="Number of rows to display (default: 10)"
     )
+    parser.add_argument(
+        "--block",
+        type=int,
+        default=None,
+        help="Block number to start the preview from (uses the seek index)"
+    )
+    parser.add_argument(
+        "--offset",
+        type=int,
+        default=0,
+        help="Number of rows to skip from the start of the block (uses the seek index)"
+    )
+    parser.add_argument(
+        "--build-index",
+        action="store_true",
+        help="(Re)build the seek index over the input data and exit"
+    )
     args = parser.parse_args()
-    display_top_rows(args.num_rows) 
\ No newline at end of file
+    if args.build_index:
+        build_index()
+    elif args.block is not None or args.offset:
+        display_rows(args.block, args.offset, args.num_rows)
+    else:
+        display_top_rows(args.num_rows)
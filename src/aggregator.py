@@ -1,28 +1,26 @@
 import polars as pl
-from typing import Dict, Any
-
-# constants in Gwei
-MAX_EFFECTIVE = 32_000_000_000
-INCREMENT     =  1_000_000_000
-BUFFER_CONST_GWEI = 0.25  # Buffer of 0.25 ETH in Gwei
-
-# Validator statuses
-VALIDATOR_STATUSES = [
-    "withdrawal_done",
-    "active_slashed",
-    "exited_unslashed",
-    "active_ongoing",
-    "active_exiting",
-    "pending_queued",
-    "withdrawal_possible",
-    "pending_initialized",
-    "exited_slashed"
-]
+from pathlib import Path
+from typing import Dict, Any, Tuple
+
+from src.constants import (
+    MAX_EFFECTIVE, INCREMENT, BUFFER_CONST_GWEI, MAX_PLAUSIBLE_BALANCE,  # noqa: F401
+    UNMAPPED_ENTITY, VALIDATOR_STATUSES
+)
 
 
 def load_validators(path: str) -> pl.LazyFrame:
     """
     Load validators data as a LazyFrame for memory-efficient processing.
+
+    The `validator` pubkey is dictionary-encoded at ingest: each distinct
+    hex string is stored once and every row keeps a 4-byte id, shared across
+    all blocks. The dictionary itself still holds every distinct pubkey
+    (~98 MB for 1M validators), so a single block does not shrink; the gain
+    is across blocks, e.g. ~1.96 GB of strings down to ~180 MB for 20 blocks
+    of the same 1M validators. Polars prunes `validator` from the scan when
+    nothing reads it, so this only matters for pipelines that keep the
+    column (such as a pubkey-keyed entity map). Use `pubkey_hex` to get the
+    original hex strings back.
     """
     return (
         pl.scan_ndjson(path)
@@ -30,14 +28,103 @@ def load_validators(path: str) -> pl.LazyFrame:
             pl.col("index").cast(pl.Int64),
             pl.col("balance").cast(pl.Float64),
             pl.col("status").cast(pl.Utf8),
-            pl.col("validator").cast(pl.Utf8),
+            pl.col("validator").cast(pl.Utf8).cast(pl.Categorical),
             pl.col("block_number").cast(pl.Int64),
         ])
     )
 
-def compute_block_stats(lazy_df: pl.LazyFrame) -> Dict[str, Dict[str, Any]]:
+def pubkey_hex(column: str = "validator") -> pl.Expr:
+    """
+    Convert a dictionary-encoded pubkey column back to its hex string (lossless).
+    """
+    return pl.col(column).cast(pl.Utf8)
+
+def gwei_sum(column: str) -> pl.Expr:
+    """
+    Sum an integral Gwei column in Int64 and return it as Float64. Integer
+    addition does not depend on summation order, so the result is the same
+    whatever the chunking or backend. Fractional parts are dropped; rows that
+    have one are counted by the `fractional_balance` quality check, which
+    fails the run under the default policy.
+    """
+    return pl.col(column).cast(pl.Int64).sum().cast(pl.Float64)
+
+def quality_exprs(columns: list[str]) -> list[pl.Expr]:
+    """
+    Data-quality aggregations evaluated per block alongside the block metrics,
+    so the checks ride on the same scan instead of a separate pass.
+    Each expression yields the number of offending rows in the group.
+    """
+    exprs = [
+        pl.col("balance").is_null().sum().alias("dq_null_balance"),
+        (pl.col("balance") < 0).sum().alias("dq_negative_balance"),
+        (pl.col("balance") > MAX_PLAUSIBLE_BALANCE).sum().alias("dq_excessive_balance"),
+        # Balances are whole Gwei; gwei_sum would drop any fraction
+        (pl.col("balance") != pl.col("balance").floor()).sum().alias("dq_fractional_balance"),
+        (~pl.col("status").is_in(VALIDATOR_STATUSES)).fill_null(True).sum().alias("dq_unknown_status"),
+    ]
+    if "index" in columns:
+        # Hash-based distinct count; every row beyond the first per index is a duplicate
+        exprs.append((pl.len() - pl.col("index").n_unique()).alias("dq_duplicate_rows"))
+    return exprs
+
+def load_entity_map(path: str | Path) -> pl.DataFrame:
+    """
+    Load a validator -> entity mapping from a CSV or Parquet file with an
+    `entity` column and a key column, either `index` or `validator` (pubkey).
+    The mapping is loaded eagerly since it is the small (broadcast) side of the join.
+
+    Raises:
+        ValueError: If the file has no usable key column or maps a key twice.
+    """
+    path = Path(path)
+    mapping = pl.read_parquet(path) if path.suffix == ".parquet" else pl.read_csv(path)
+
+    key = next((k for k in ("index", "validator") if k in mapping.columns), None)
+    if key is None or "entity" not in mapping.columns:
+        raise ValueError(f"Entity mapping {path} needs an 'entity' column and an 'index' or 'validator' column")
+
+    mapping = mapping.select([
+        pl.col("index").cast(pl.Int64) if key == "index" else pl.col("validator").cast(pl.Utf8).cast(pl.Categorical),
+        pl.col("entity").cast(pl.Utf8),
+    ])
+    if mapping[key].is_duplicated().any():
+        raise ValueError(f"Entity mapping {path} maps some '{key}' values more than once")
+    return mapping
+
+def entity_stats_plan(lazy_df: pl.LazyFrame, mapping: pl.DataFrame) -> pl.LazyFrame:
+    """
+    Hash-join validators to their entity and aggregate per (block, entity).
+    Expects `lazy_df` to already carry the `effective_balance` column.
+    Sums are left unrounded (Float64); status counts are one `status_<name>` column each.
+    """
+    key = mapping.columns[0]
+    return (
+        lazy_df
+        .join(mapping.lazy(), on=key, how="left")
+        .with_columns(pl.col("entity").fill_null(UNMAPPED_ENTITY))
+        .group_by(["block_number", "entity"])
+        .agg([
+            gwei_sum("balance").alias("balance"),
+            gwei_sum("effective_balance").alias("effective_balance"),
+            pl.col("status").str.contains("_slashed").sum().cast(pl.Int64).alias("slashed"),
+            *[(pl.col("status") == status).sum().cast(pl.Int64).alias(f"status_{status}") for status in VALIDATOR_STATUSES],
+        ])
+        .sort(["block_number", "entity"])
+    )
+
+def compute_block_stats(
+    lazy_df: pl.LazyFrame,
+    entity_map: str | Path | None = None,
+) -> Dict[str, Dict[str, Any]] | Tuple[Dict[str, Dict[str, Any]], pl.DataFrame]:
+    """
+    Aggregate balances, slashed and status counts per block.
+
+    If `entity_map` is given, also aggregate per (block, entity) from the same
+    scan and return a tuple of (block stats, entity stats DataFrame).
+    """
     # Chain all operations in a single expression
-    merged = (
+    base = (
         lazy_df
         .with_columns([
             (
@@ -46,13 +133,16 @@ def compute_block_stats(lazy_df: pl.LazyFrame) -> Dict[str, Dict[str, Any]]:
                 * INCREMENT                                                    # Multiply back by INCREMENT
             ).alias("effective_balance")
         ])
+    )
+    blocks_plan = (
+        base
         # Then group and aggregate
         .group_by("block_number")
         .agg([
             # Calculate balance with 9 decimal precision
-            pl.col("balance").sum().cast(pl.Float64).map_elements(lambda x: float(f"{x:.9e}"), return_dtype=pl.Float64).alias("total_balance"),
+            gwei_sum("balance").map_elements(lambda x: float(f"{x:.9e}"), return_dtype=pl.Float64).alias("total_balance"),
             # Calculate effective balance with 6 decimal precision (scientific notation)
-            pl.col("effective_balance").sum().cast(pl.Float64).map_elements(lambda x: float(f"{x:.6e}"), return_dtype=pl.Float64).alias("total_effective_balance"),
+            gwei_sum("effective_balance").map_elements(lambda x: float(f"{x:.6e}"), return_dtype=pl.Float64).alias("total_effective_balance"),
             # Calculate slashed count
             pl.col("status")
               .filter(pl.col("status").str.contains("_slashed"))
@@ -62,10 +152,21 @@ def compute_block_stats(lazy_df: pl.LazyFrame) -> Dict[str, Dict[str, Any]]:
             pl.col("status")
               .value_counts()
               .alias("status_counts"),
+            # Data-quality counters computed in the same aggregation
+            *quality_exprs(lazy_df.collect_schema().names()),
         ])
-        .collect(engine="streaming")
     )
 
+    entity_df = None
+    if entity_map is None:
+        merged = blocks_plan.collect(engine="streaming")
+    else:
+        # Both plans share the input scan through common subplan elimination
+        merged, entity_df = pl.collect_all(
+            [blocks_plan, entity_stats_plan(base, load_entity_map(entity_map))],
+            engine="streaming",
+        )
+
     result: Dict[str, Dict[str, Any]] = {}
     for row in merged.iter_rows(named=True):
         blk = str(row["block_number"])
@@ -76,7 +177,8 @@ def compute_block_stats(lazy_df: pl.LazyFrame) -> Dict[str, Dict[str, Any]]:
             "balance":               row["total_balance"],  
             "effective_balance":     row["total_effective_balance"],  
             "slashed":               int(row["slashed_count"]),
-            "status":               {status: 0 for status in VALIDATOR_STATUSES}
+            "status":               {status: 0 for status in VALIDATOR_STATUSES},
+            "quality":              {k[len("dq_"):]: int(v) for k, v in row.items() if k.startswith("dq_")},
         }
 
         # Update with actual counts
@@ -88,6 +190,8 @@ def compute_block_stats(lazy_df: pl.LazyFrame) -> Dict[str, Dict[str, Any]]:
         
         result[blk] = block_data
     
+    if entity_df is not None:
+        return result, entity_df
     return result
 
 
@@ -0,0 +1,370 @@
+"""
+Aggregation backend built on PyArrow compute and NumPy only.
+
+Mirrors `src.aggregator` (the Polars backend) function for function so the
+two can be swapped through `src.backends`. Input is streamed in record
+batches; statuses are dictionary-encoded to integer codes and every
+per-block / per-entity count is a single `np.bincount` per batch.
+"""
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.json as pa_json
+import pyarrow.parquet as pq
+
+from src.config import ARROW_BLOCK_SIZE
+from src.constants import (
+    MAX_EFFECTIVE, INCREMENT, MAX_PLAUSIBLE_BALANCE,
+    UNMAPPED_ENTITY, VALIDATOR_STATUSES
+)
+
+QUALITY_CHECKS = ["null_balance", "negative_balance", "excessive_balance", "fractional_balance", "unknown_status"]
+
+# Largest validator index mapped to entities through a dense array (4 bytes per slot)
+DENSE_LOOKUP_LIMIT = 2**24
+
+
+def _round(x: float, digits: int) -> float:
+    # Same significant-digit rounding as the Polars backend
+    return float(f"{x:.{digits}e}")
+
+
+def _codes(values: pa.Array, names: List[Any], lookup: Dict[Any, int]) -> np.ndarray:
+    """
+    Dictionary-encode `values` and translate the batch-local dictionary into
+    stable codes, appending unseen values (including None) to `names`.
+    """
+    encoded = pc.dictionary_encode(values)
+    if isinstance(encoded, pa.ChunkedArray):
+        encoded = encoded.combine_chunks()
+    dictionary = encoded.dictionary.to_pylist() + [None]
+    for value in dictionary:
+        if value not in lookup:
+            lookup[value] = len(names)
+            names.append(value)
+    lut = np.array([lookup[value] for value in dictionary], dtype=np.int64)
+    indices = pc.fill_null(encoded.indices, len(dictionary) - 1)
+    return lut[indices.to_numpy(zero_copy_only=False)]
+
+
+def _int_sums(groups: np.ndarray, values: np.ndarray, size: int) -> np.ndarray:
+    """
+    Per-group Int64 sums. Unlike float `np.bincount` weights these are exact,
+    so totals do not depend on how rows are split into batches.
+    """
+    sums = np.zeros(size, dtype=np.int64)
+    np.add.at(sums, groups, values)
+    return sums
+
+
+def _grow(arr: np.ndarray, size: int) -> np.ndarray:
+    if arr.shape[-1] >= size:
+        return arr
+    pad = [(0, 0)] * (arr.ndim - 1) + [(0, size - arr.shape[-1])]
+    return np.pad(arr, pad)
+
+
+def _entity_lookup(keys: pa.ChunkedArray, codes: np.ndarray) -> Callable[[pa.Array], np.ndarray]:
+    """
+    Prepare a mapping key -> entity code lookup once for the whole stream.
+
+    Non-negative integer keys up to DENSE_LOOKUP_LIMIT are looked up in a
+    dense array indexed by key. Other keys (pubkeys, or very large indices)
+    go through a dict applied to each batch's distinct values. Nulls and keys
+    missing from the mapping get code 0 (unmapped).
+    """
+    valid = keys.is_valid().to_numpy(zero_copy_only=False)
+    codes = codes[valid].astype(np.int32)
+    keys = keys.filter(pa.array(valid))
+
+    if pa.types.is_integer(keys.type):
+        values = keys.to_numpy()
+        if len(values) and values.min() >= 0 and values.max() < DENSE_LOOKUP_LIMIT:
+            dense = np.zeros(int(values.max()) + 1, dtype=np.int32)
+            dense[values] = codes
+
+            def lookup(batch_keys: pa.Array) -> np.ndarray:
+                key_np = pc.fill_null(batch_keys, -1).to_numpy(zero_copy_only=False)
+                inside = (key_np >= 0) & (key_np < len(dense))
+                return np.where(inside, dense[np.where(inside, key_np, 0)], 0)
+
+            return lookup
+
+    by_key = dict(zip(keys.to_pylist(), codes.tolist()))
+
+    def lookup(batch_keys: pa.Array) -> np.ndarray:
+        encoded = pc.dictionary_encode(batch_keys)
+        if isinstance(encoded, pa.ChunkedArray):
+            encoded = encoded.combine_chunks()
+        dictionary = encoded.dictionary.to_pylist()
+        lut = np.array([by_key.get(value, 0) for value in dictionary] + [0], dtype=np.int32)
+        return lut[pc.fill_null(encoded.indices, len(dictionary)).to_numpy(zero_copy_only=False)]
+
+    return lookup
+
+
+def load_validators(path: str, block_size: int = ARROW_BLOCK_SIZE) -> Iterator[pa.RecordBatch]:
+    """
+    Stream validators data as record batches for chunked processing.
+    Each batch holds the rows parsed from roughly `block_size` bytes of JSON.
+
+    Chunks are parsed independently (unlike `pyarrow.json.open_json`, which
+    fixes the schema from the first chunk), so a column that is all-null in
+    one chunk does not break parsing of the next; types are normalised by
+    the casts in `compute_block_stats`.
+    """
+    with pa.input_stream(str(path)) as stream:
+        remainder = b""
+        while True:
+            data = stream.read(block_size)
+            chunk = remainder + data
+            if data:
+                cut = chunk.rfind(b"\n") + 1
+                chunk, remainder = chunk[:cut], chunk[cut:]
+            if chunk.strip():
+                yield from pa_json.read_json(pa.BufferReader(chunk)).to_batches()
+            if not data:
+                return
+
+
+def load_entity_map(path: str | Path) -> pa.Table:
+    """
+    Load a validator -> entity mapping from a CSV or Parquet file with an
+    `entity` column and a key column, either `index` or `validator` (pubkey).
+
+    Raises:
+        ValueError: If the file has no usable key column or maps a key twice.
+    """
+    path = Path(path)
+    if path.suffix == ".parquet":
+        mapping = pq.read_table(path)
+    else:
+        # Pin key types so hex pubkeys are never inferred as integers
+        mapping = pa_csv.read_csv(path, convert_options=pa_csv.ConvertOptions(
+            column_types={"index": pa.int64(), "validator": pa.string()},
+        ))
+
+    key = next((k for k in ("index", "validator") if k in mapping.column_names), None)
+    if key is None or "entity" not in mapping.column_names:
+        raise ValueError(f"Entity mapping {path} needs an 'entity' column and an 'index' or 'validator' column")
+
+    mapping = pa.table({
+        key: pc.cast(mapping[key], pa.int64() if key == "index" else pa.string()),
+        "entity": pc.cast(mapping["entity"], pa.string()),
+    })
+    if pc.count_distinct(mapping[key], mode="all").as_py() != mapping.num_rows:
+        raise ValueError(f"Entity mapping {path} maps some '{key}' values more than once")
+    return mapping
+
+
+def compute_block_stats(
+    batches: Iterable[pa.RecordBatch] | pa.Table,
+    entity_map: str | Path | None = None,
+) -> Dict[str, Dict[str, Any]] | Tuple[Dict[str, Dict[str, Any]], pa.Table]:
+    """
+    Aggregate balances, slashed and status counts per block, one batch at a time.
+
+    If `entity_map` is given, also aggregate per (block, entity) in the same
+    pass and return a tuple of (block stats, entity stats Table).
+    """
+    if isinstance(batches, pa.Table):
+        batches = batches.to_batches()
+
+    # Status codes: known statuses first, unknown values appended as they appear
+    status_names: List[Any] = list(VALIDATOR_STATUSES)
+    status_lookup = {name: code for code, name in enumerate(status_names)}
+
+    mapping = load_entity_map(entity_map) if entity_map is not None else None
+    if mapping is not None:
+        key = mapping.column_names[0]
+        # Code 0 is the unmapped entity; null entities in the mapping fall under it too
+        entity_names: List[Any] = [UNMAPPED_ENTITY]
+        entity_lookup: Dict[Any, int] = {UNMAPPED_ENTITY: 0, None: 0}
+        entity_of_row = _codes(mapping["entity"], entity_names, entity_lookup)
+        # Built once here rather than hashing the mapping again for every batch
+        entity_of_key = _entity_lookup(mapping[key], entity_of_row)
+        n_entities = len(entity_names)
+        n_known = len(VALIDATOR_STATUSES)
+
+    acc: Dict[Any, Dict[str, Any]] = {}
+    for batch in batches:
+        if batch.num_rows == 0:
+            continue
+
+        # Null block numbers form their own None group, as in the Polars group_by
+        block_numbers = pc.cast(batch.column("block_number"), pa.int64())
+        null_block = block_numbers.is_null().to_numpy(zero_copy_only=False)
+        blocks, local_valid = np.unique(
+            pc.drop_null(block_numbers).to_numpy(zero_copy_only=False), return_inverse=True
+        )
+        blocks = blocks.tolist()
+        local = np.empty(batch.num_rows, dtype=np.int64)
+        local[~null_block] = local_valid
+        if null_block.any():
+            local[null_block] = len(blocks)
+            blocks.append(None)
+        n_blocks = len(blocks)
+
+        balance = pc.cast(batch.column("balance"), pa.float64())
+        null_balance = balance.is_null().to_numpy(zero_copy_only=False)
+        bal = pc.fill_null(balance, 0.0).to_numpy(zero_copy_only=False)
+        eff = np.floor(np.minimum(bal, MAX_EFFECTIVE) / INCREMENT) * INCREMENT
+        # Balances are integral Gwei; sum them as integers like the Polars backend
+        bal_gwei = bal.astype(np.int64)
+        eff_gwei = eff.astype(np.int64)
+
+        codes = _codes(pc.cast(batch.column("status"), pa.string()), status_names, status_lookup)
+        n_codes = len(status_names)
+        slashed_flag = np.array([name is not None and "_slashed" in name for name in status_names])
+
+        bal_sums = _int_sums(local, bal_gwei, n_blocks)
+        eff_sums = _int_sums(local, eff_gwei, n_blocks)
+        counts = np.bincount(local * n_codes + codes, minlength=n_blocks * n_codes).reshape(n_blocks, n_codes)
+        dq = {
+            "null_balance": np.bincount(local, weights=null_balance, minlength=n_blocks),
+            "negative_balance": np.bincount(local, weights=bal < 0, minlength=n_blocks),
+            "excessive_balance": np.bincount(local, weights=bal > MAX_PLAUSIBLE_BALANCE, minlength=n_blocks),
+            "fractional_balance": np.bincount(local, weights=bal != np.floor(bal), minlength=n_blocks),
+        }
+
+        has_index = "index" in batch.schema.names
+        if has_index:
+            index = pc.cast(batch.column("index"), pa.int64())
+            null_index = index.is_null().to_numpy(zero_copy_only=False)
+            index_np = pc.fill_null(index, 0).to_numpy(zero_copy_only=False)
+
+        if mapping is not None:
+            keys = pc.cast(batch.column(key), pa.int64() if key == "index" else pa.string())
+            ent = entity_of_key(keys)
+            group = local * n_entities + ent
+            known = np.where(codes < n_known, codes, n_known)
+            n_groups = n_blocks * n_entities
+            ent_rows = np.bincount(group, minlength=n_groups).reshape(n_blocks, n_entities)
+            ent_bal = _int_sums(group, bal_gwei, n_groups).reshape(n_blocks, n_entities)
+            ent_eff = _int_sums(group, eff_gwei, n_groups).reshape(n_blocks, n_entities)
+            ent_slashed = np.bincount(group, weights=slashed_flag[codes], minlength=n_groups).reshape(n_blocks, n_entities)
+            ent_status = np.bincount(
+                group * (n_known + 1) + known, minlength=n_groups * (n_known + 1)
+            ).reshape(n_blocks, n_entities, n_known + 1)[:, :, :n_known]
+
+        for j, blk in enumerate(blocks):
+            state = acc.get(blk)
+            if state is None:
+                state = acc[blk] = {
+                    "balance": 0,
+                    "effective_balance": 0,
+                    "counts": np.zeros(n_codes, dtype=np.int64),
+                    "dq": dict.fromkeys(dq, 0),
+                    "has_index": False,
+                    "indices": [],
+                    "null_index": 0,
+                }
+                if mapping is not None:
+                    state["entity"] = {
+                        "rows": np.zeros(n_entities, dtype=np.int64),
+                        "balance": np.zeros(n_entities, dtype=np.int64),
+                        "effective_balance": np.zeros(n_entities, dtype=np.int64),
+                        "slashed": np.zeros(n_entities, dtype=np.int64),
+                        "status": np.zeros((n_entities, n_known), dtype=np.int64),
+                    }
+
+            state["balance"] += int(bal_sums[j])
+            state["effective_balance"] += int(eff_sums[j])
+            state["counts"] = _grow(state["counts"], n_codes)
+            state["counts"][:n_codes] += counts[j]
+            for check, values in dq.items():
+                state["dq"][check] += int(values[j])
+
+            if has_index:
+                # Keep each block's non-null indices; duplicates are counted once all batches are in
+                state["has_index"] = True
+                rows = local == j
+                state["null_index"] += int(null_index[rows].sum())
+                state["indices"].append(index_np[rows & ~null_index])
+
+            if mapping is not None:
+                entity = state["entity"]
+                entity["rows"] += ent_rows[j]
+                entity["balance"] += ent_bal[j]
+                entity["effective_balance"] += ent_eff[j]
+                entity["slashed"] += ent_slashed[j].astype(np.int64)
+                entity["status"] += ent_status[j]
+
+    result: Dict[str, Dict[str, Any]] = {}
+    for blk, state in acc.items():
+        counts = _grow(state["counts"], len(status_names))
+        quality = {
+            **state["dq"],
+            "unknown_status": int(counts[len(VALIDATOR_STATUSES):].sum()),
+        }
+        if state["has_index"]:
+            # Sort-based distinct count, sized by the rows rather than the index values;
+            # nulls count as one distinct index, matching the Polars backend
+            indices = np.concatenate(state.pop("indices"))
+            duplicates = len(indices) - len(np.unique(indices))
+            quality["duplicate_rows"] = duplicates + max(state["null_index"] - 1, 0)
+
+        result[str(blk)] = {
+            "balance":               _round(float(state["balance"]), 9),
+            "effective_balance":     _round(float(state["effective_balance"]), 6),
+            "slashed":               int(sum(c for name, c in zip(status_names, counts) if name is not None and "_slashed" in name)),
+            "status":                {status: int(counts[code]) for code, status in enumerate(VALIDATOR_STATUSES)},
+            "quality":               {check: int(quality[check]) for check in [*QUALITY_CHECKS, "duplicate_rows"] if check in quality},
+        }
+
+    if mapping is None:
+        return result
+    return result, _entity_table(acc, entity_names)
+
+
+def _entity_table(acc: Dict[Any, Dict[str, Any]], entity_names: List[Any]) -> pa.Table:
+    """Flatten per-block entity accumulators into a table sorted by (block, entity)."""
+    columns: Dict[str, List[np.ndarray]] = {
+        "block_number": [], "entity": [], "balance": [], "effective_balance": [], "slashed": [],
+        **{f"status_{status}": [] for status in VALIDATOR_STATUSES},
+    }
+    names = np.array(entity_names, dtype=object)
+    order = np.array(sorted(range(len(entity_names)), key=lambda code: entity_names[code]), dtype=np.int64)
+    # Nulls first, matching the Polars sort
+    for blk in sorted(acc, key=lambda blk: (blk is not None, blk or 0)):
+        entity = acc[blk]["entity"]
+        # Entities in name order, keeping only those with rows in this block
+        codes = order[entity["rows"][order] > 0]
+        columns["block_number"].append(np.full(len(codes), blk, dtype=object))
+        columns["entity"].append(names[codes])
+        columns["balance"].append(entity["balance"][codes].astype(np.float64))
+        columns["effective_balance"].append(entity["effective_balance"][codes].astype(np.float64))
+        columns["slashed"].append(entity["slashed"][codes])
+        for k, status in enumerate(VALIDATOR_STATUSES):
+            columns[f"status_{status}"].append(entity["status"][codes, k])
+
+    return pa.table({
+        name: pa.array(
+            np.concatenate(values) if values else [],
+            type=pa.string() if name == "entity" else pa.float64() if "balance" in name else pa.int64(),
+        )
+        for name, values in columns.items()
+    })
+
+
+def compute_totals(blocks: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Sum totals across all blocks. Returns a flat dict with keys:
+    balance, effective_balance, slashed, plus aggregated status counts.
+    """
+    balance = np.array([b["balance"] for b in blocks.values()], dtype=np.float64)
+    effective_balance = np.array([b["effective_balance"] for b in blocks.values()], dtype=np.float64)
+
+    return {
+        "balance": _round(float(balance.sum()), 9),
+        "effective_balance": _round(float(effective_balance.sum()), 6),
+        "slashed": int(sum(b["slashed"] for b in blocks.values())),
+        "status": {
+            status: int(sum(b["status"].get(status, 0) for b in blocks.values()))
+            for status in VALIDATOR_STATUSES
+        },
+    }
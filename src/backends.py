@@ -0,0 +1,27 @@
+"""
+Aggregation backend registry.
+
+A backend is a module exposing `load_validators(path)`,
+`compute_block_stats(data, entity_map=None)` and `compute_totals(blocks)`
+with the same return values as `src.aggregator`. Backends are imported on
+demand, so images without Polars can still run the arrow backend.
+"""
+import importlib
+from types import ModuleType
+
+BACKENDS = {
+    "polars": "src.aggregator",
+    "arrow": "src.arrow_aggregator",
+}
+
+
+def get_backend(name: str) -> ModuleType:
+    """
+    Return the aggregation backend module registered under `name`.
+
+    Raises:
+        ValueError: If no backend is registered under `name`.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown aggregation backend '{name}', expected one of {sorted(BACKENDS)}")
+    return importlib.import_module(BACKENDS[name])
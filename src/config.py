@@ -1,9 +1,19 @@
 from pathlib import Path
 
 LOG_LEVEL = "INFO"
+# Aggregation engine, see src.backends.BACKENDS ("polars" or "arrow")
+AGGREGATION_BACKEND = "polars"
+ARROW_BLOCK_SIZE = 16 * 1024 * 1024  # Bytes of JSON parsed per batch by the arrow backend
 LOG_DIR = Path("logs")
 INPUT_PATH  = Path("input_data/validators_data.jsonl.gz")
 OUTPUT_DIR  = Path("output")
+# Watch mode (python -m src.main --watch): inputs in INPUT_DIR matching INPUT_PATTERN
+# are reprocessed once no further change was seen for WATCH_DEBOUNCE_SECONDS, or at
+# the latest WATCH_MAX_DELAY_SECONDS after the first change if writes keep arriving
+INPUT_DIR = INPUT_PATH.parent
+INPUT_PATTERN = "*.jsonl.gz"
+WATCH_DEBOUNCE_SECONDS = 2.0
+WATCH_MAX_DELAY_SECONDS = 5 * WATCH_DEBOUNCE_SECONDS
 BLOCK_FILES = {
     "balance": OUTPUT_DIR / "balance_block.json",
     "effective_balance": OUTPUT_DIR / "effective_balance_block.json",
@@ -16,3 +26,31 @@ TOTAL_FILES = {
     "slashed": OUTPUT_DIR / "slashed_total.json",
     "status": OUTPUT_DIR / "status_total.json",
 }
+# Optional CSV/Parquet mapping validator `index` or `validator` pubkey -> `entity`;
+# when set, per (block, entity) stats are written to ENTITY_FILE
+ENTITY_MAP_PATH = None
+ENTITY_FILE = OUTPUT_DIR / "entity_block.parquet"
+
+QUALITY_FILE = OUTPUT_DIR / "quality_block.json"
+
+# Action taken when a data-quality check finds offending rows: "fail", "warn" or "ignore"
+QUALITY_POLICY = {
+    "duplicate_rows": "fail",
+    "null_balance": "fail",
+    "negative_balance": "fail",
+    # Sums are taken over whole Gwei, so a fractional balance would be truncated
+    "fractional_balance": "fail",
+    "excessive_balance": "warn",
+    "unknown_status": "warn",
+}
+
+# Directory where main publishes result tables as Arrow IPC for co-located
+# consumers (e.g. Path("/dev/shm/validator_results")); None disables publishing
+PUBLISH_DIR = None
+PUBLISH_KEEP_GENERATIONS = 2  # Generations kept on disk for readers still attached
+
+# Seekable gzip index used for random-access previews of INPUT_PATH
+GZ_INDEX_PATH = INPUT_PATH.with_name(INPUT_PATH.name + ".gzidx")
+ROW_INDEX_PATH = INPUT_PATH.with_name(INPUT_PATH.name + ".rows.json")
+GZ_INDEX_SPACING = 4 * 1024 * 1024  # Uncompressed bytes between zlib checkpoints
+ROW_INDEX_STRIDE = 10_000           # Rows between recorded line offsets
@@ -0,0 +1,24 @@
+"""
+Aggregation constants shared by all backends (kept free of engine imports).
+"""
+# constants in Gwei
+MAX_EFFECTIVE = 32_000_000_000
+INCREMENT     =  1_000_000_000
+BUFFER_CONST_GWEI = 0.25  # Buffer of 0.25 ETH in Gwei
+MAX_PLAUSIBLE_BALANCE = 2_048_000_000_000  # Max effective balance of a compounding validator
+
+# Entity assigned to validators missing from the entity mapping
+UNMAPPED_ENTITY = "unmapped"
+
+# Validator statuses
+VALIDATOR_STATUSES = [
+    "withdrawal_done",
+    "active_slashed",
+    "exited_unslashed",
+    "active_ongoing",
+    "active_exiting",
+    "pending_queued",
+    "withdrawal_possible",
+    "pending_initialized",
+    "exited_slashed"
+]
@@ -0,0 +1,180 @@
+import json
+import re
+from pathlib import Path
+from typing import Any, Dict, List
+
+import indexed_gzip
+
+from src.config import (
+    INPUT_PATH, GZ_INDEX_PATH, ROW_INDEX_PATH,
+    GZ_INDEX_SPACING, ROW_INDEX_STRIDE
+)
+from src.logger import logger
+
+_BLOCK_RE = re.compile(rb'"block_number"\s*:\s*"?(\d+)')
+
+
+def _source_stamp(data_path: Path) -> Dict[str, int]:
+    stat = data_path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def build_index(
+    data_path: str | Path = INPUT_PATH,
+    gz_index_path: str | Path = GZ_INDEX_PATH,
+    row_index_path: str | Path = ROW_INDEX_PATH,
+    spacing: int = GZ_INDEX_SPACING,
+    stride: int = ROW_INDEX_STRIDE,
+) -> Dict[str, Any]:
+    """
+    Build a zran-style seek index over a gzipped JSONL file in a single pass.
+
+    Two files are written next to the input:
+      - `gz_index_path`: zlib checkpoints (compressed offset + 32 KiB window)
+        every `spacing` uncompressed bytes, exported by indexed_gzip.
+      - `row_index_path`: JSON with the uncompressed offset of every
+        `stride`-th row and, per block, its first row, row count and the
+        (first row, row count) of each contiguous run of the block.
+
+    Returns:
+        The row index as stored in `row_index_path`.
+    """
+    data_path = Path(data_path)
+    logger.info(f"Building seek index for {data_path}")
+
+    checkpoints: List[int] = []
+    blocks: Dict[str, Dict[str, int]] = {}
+    current_block = None
+    row = 0
+    pos = 0
+
+    with indexed_gzip.IndexedGzipFile(str(data_path), spacing=spacing) as f:
+        for line in f:
+            if not line.strip():
+                pos += len(line)
+                continue
+            if row % stride == 0:
+                checkpoints.append(pos)
+            match = _BLOCK_RE.search(line)
+            block = match.group(1).decode() if match else None
+            if block != current_block:
+                # Blocks are expected to be contiguous; a repeated block gets another run
+                info = blocks.setdefault(block, {"row": row, "rows": 0, "runs": []})
+                if info["runs"] and block is not None:
+                    logger.warning(f"Block {block} reappears at row {row}, indexing it as a separate run")
+                info["runs"].append([row, 0])
+                current_block = block
+            blocks[block]["rows"] += 1
+            blocks[block]["runs"][-1][1] += 1
+            row += 1
+            pos += len(line)
+
+        f.build_full_index()
+        f.export_index(str(gz_index_path))
+
+    row_index = {
+        "source": _source_stamp(data_path),
+        "stride": stride,
+        "rows": row,
+        "checkpoints": checkpoints,
+        "blocks": {blk: info for blk, info in blocks.items() if blk is not None},
+    }
+    with open(row_index_path, "w") as f:
+        json.dump(row_index, f)
+
+    logger.info(f"Indexed {row} rows across {len(row_index['blocks'])} blocks")
+    return row_index
+
+
+def load_index(
+    data_path: str | Path = INPUT_PATH,
+    gz_index_path: str | Path = GZ_INDEX_PATH,
+    row_index_path: str | Path = ROW_INDEX_PATH,
+) -> Dict[str, Any] | None:
+    """
+    Load the row index, or return None if it is missing or was built for a
+    different version of the input file.
+    """
+    if not Path(gz_index_path).exists() or not Path(row_index_path).exists():
+        return None
+    with open(row_index_path, "r") as f:
+        row_index = json.load(f)
+    if row_index.get("source") != _source_stamp(Path(data_path)):
+        logger.warning(f"Seek index for {data_path} is stale")
+        return None
+    return row_index
+
+
+def get_index(
+    data_path: str | Path = INPUT_PATH,
+    gz_index_path: str | Path = GZ_INDEX_PATH,
+    row_index_path: str | Path = ROW_INDEX_PATH,
+) -> Dict[str, Any]:
+    """Load the row index, building it first if needed."""
+    row_index = load_index(data_path, gz_index_path, row_index_path)
+    if row_index is None:
+        row_index = build_index(data_path, gz_index_path, row_index_path)
+    return row_index
+
+
+def read_rows(
+    block: int | None = None,
+    offset: int = 0,
+    n: int = 10,
+    data_path: str | Path = INPUT_PATH,
+    gz_index_path: str | Path = GZ_INDEX_PATH,
+    row_index_path: str | Path = ROW_INDEX_PATH,
+) -> List[Dict]:
+    """
+    Read `n` rows starting `offset` rows after the start of `block` (or of the
+    file when `block` is None), seeking straight to the nearest checkpoint.
+    The offset counts only rows of `block`, even if the block is split into
+    several runs; reading continues past the end of that run.
+
+    Raises:
+        ValueError: If `offset` is negative or `n` is less than 1.
+        KeyError: If `block` is not present in the input file.
+    """
+    if offset < 0:
+        raise ValueError(f"offset must be non-negative, got {offset}")
+    if n < 1:
+        raise ValueError(f"n must be at least 1, got {n}")
+
+    row_index = get_index(data_path, gz_index_path, row_index_path)
+
+    start = offset
+    if block is not None:
+        info = row_index["blocks"].get(str(block))
+        if info is None:
+            raise KeyError(f"Block {block} not found in {data_path}")
+        # Index files written before runs were recorded hold a single run
+        runs = info.get("runs", [[info["row"], info["rows"]]])
+        for run_row, run_rows in runs:
+            if offset < run_rows:
+                break
+            offset -= run_rows
+        else:
+            # Past the last row of the block: continue after its last run
+            run_row += run_rows
+        start = run_row + offset
+
+    if start >= row_index["rows"]:
+        return []
+
+    stride = row_index["stride"]
+    checkpoint = start // stride
+    skip = start - checkpoint * stride
+
+    rows: List[Dict] = []
+    with indexed_gzip.IndexedGzipFile(str(data_path), index_file=str(gz_index_path)) as f:
+        f.seek(row_index["checkpoints"][checkpoint])
+        for line in f:
+            if not line.strip():
+                continue
+            if skip:
+                skip -= 1
+                continue
+            if len(rows) >= n:
+                break
+            rows.append(json.loads(line))
+    return rows
@@ -1,46 +1,92 @@
+import argparse
+from pathlib import Path
+
 from src.config import (
-    LOG_LEVEL, LOG_DIR, INPUT_PATH, OUTPUT_DIR,
-    BLOCK_FILES, TOTAL_FILES
+    AGGREGATION_BACKEND, LOG_LEVEL, LOG_DIR, INPUT_PATH, OUTPUT_DIR,
+    BLOCK_FILES, TOTAL_FILES, QUALITY_FILE, QUALITY_POLICY,
+    PUBLISH_DIR, ENTITY_MAP_PATH, ENTITY_FILE
 )
 from src.logger import init_logger, logger
-from src.aggregator import load_validators, compute_block_stats, compute_totals
-from src.utils import save_json
+from src.backends import get_backend
+from src.quality import quality_report, apply_quality_policy
+from src.utils import save_json, save_parquet
 
-def main():
-    # Initialize logger
-    init_logger(log_level=LOG_LEVEL, log_file=LOG_DIR / "aggregator.log")
-    logger.info("Starting data processing")
+def output_dir_for(input_path: str | Path) -> Path:
+    """
+    Outputs of INPUT_PATH go to OUTPUT_DIR; any other input file gets a
+    subdirectory of OUTPUT_DIR named after it.
+    """
+    input_path = Path(input_path)
+    if input_path == INPUT_PATH:
+        return OUTPUT_DIR
+    return OUTPUT_DIR / input_path.name.removesuffix(".jsonl.gz")
+
+def process(input_path: str | Path = INPUT_PATH) -> None:
+    """
+    Run the aggregation pipeline for one input file and write its outputs.
+    """
+    output_dir = output_dir_for(input_path)
 
     try:
-        # Read data as LazyFrame for memory-efficient processing
-        logger.info(f"Reading input data from {INPUT_PATH}")
-        lazy_df = load_validators(INPUT_PATH)
-        logger.info("Data loaded as LazyFrame")
+        backend = get_backend(AGGREGATION_BACKEND)
+        logger.info(f"Using {AGGREGATION_BACKEND} aggregation backend")
+
+        # Read data lazily (LazyFrame or batch stream) for memory-efficient processing
+        logger.info(f"Reading input data from {input_path}")
+        lazy_df = backend.load_validators(input_path)
+        logger.info("Data source opened")
         
         # Process data using lazy evaluation
         logger.info("Computing block statistics")
-        block_stats = compute_block_stats(lazy_df)
+        entity_df = None
+        if ENTITY_MAP_PATH is None:
+            block_stats = backend.compute_block_stats(lazy_df)
+        else:
+            logger.info(f"Aggregating per entity using mapping {ENTITY_MAP_PATH}")
+            block_stats, entity_df = backend.compute_block_stats(lazy_df, ENTITY_MAP_PATH)
         logger.info(f"Processed {len(block_stats)} blocks")
 
         # Compute totals
         logger.info("Computing totals")
-        totals = compute_totals(block_stats)
+        totals = backend.compute_totals(block_stats)
         logger.info("Totals computed successfully")
 
         # Create output directory
-        OUTPUT_DIR.mkdir(exist_ok=True)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        # Save the data-quality report, then enforce the policy before writing outputs
+        report = quality_report(block_stats)
+        quality_file = output_dir / QUALITY_FILE.name
+        save_json(report, quality_file)
+        logger.info(f"Saved data-quality report to {quality_file}")
+        apply_quality_policy(report, QUALITY_POLICY)
 
         # Save block statistics
         for metric, file_path in BLOCK_FILES.items():
             metric_data = {block: stats[metric] for block, stats in block_stats.items()}
-            save_json(metric_data, file_path)
-            logger.info(f"Saved {metric} block statistics to {file_path}")
+            save_json(metric_data, output_dir / file_path.name)
+            logger.info(f"Saved {metric} block statistics to {output_dir / file_path.name}")
+
+        # Save per-entity statistics
+        if entity_df is not None:
+            entity_file = output_dir / ENTITY_FILE.name
+            save_parquet(entity_df, entity_file)
+            logger.info(f"Saved {len(entity_df)} (block, entity) rows to {entity_file}")
 
         # Save totals
         for metric, file_path in TOTAL_FILES.items():
             metric_total = {metric: totals[metric]}
-            save_json(metric_total, file_path)
-            logger.info(f"Saved {metric} total to {file_path}")
+            save_json(metric_total, output_dir / file_path.name)
+            logger.info(f"Saved {metric} total to {output_dir / file_path.name}")
+
+        # Publish result tables for co-located consumers
+        if PUBLISH_DIR is not None:
+            # Only needs PyArrow, so this works without Polars under the arrow backend
+            from src.publish import results_to_frames, publish_results
+            publish_dir = Path(PUBLISH_DIR)
+            if output_dir != OUTPUT_DIR:
+                publish_dir = publish_dir / output_dir.name
+            publish_results(*results_to_frames(block_stats, totals), publish_dir)
 
         logger.info("Data processing completed successfully")
 
@@ -48,6 +94,24 @@ def main():
         logger.exception("Error during data processing")
         raise
 
-if __name__ == "__main__":
-    main()
+def main(watch: bool = False):
+    # Initialize logger
+    init_logger(log_level=LOG_LEVEL, log_file=LOG_DIR / "aggregator.log")
+
+    if watch:
+        # Imported here so inotify is only needed for watch mode
+        from src.watch import watch_inputs
+        watch_inputs(process)
+    else:
+        logger.info("Starting data processing")
+        process(INPUT_PATH)
 
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Aggregate validator data")
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and reprocess inputs whenever they change"
+    )
+    args = parser.parse_args()
+    main(watch=args.watch)
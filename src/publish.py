@@ -0,0 +1,150 @@
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+import pyarrow as pa
+
+from src.config import PUBLISH_KEEP_GENERATIONS
+from src.constants import VALIDATOR_STATUSES
+from src.logger import logger
+
+GENERATION_FILE = "generation"
+
+
+def results_to_frames(
+    blocks: Dict[str, Dict[str, Any]],
+    totals: Dict[str, Any],
+) -> Tuple[pa.Table, pa.Table]:
+    """
+    Convert block statistics and totals into flat Arrow tables, with one
+    column per metric and one `status_<name>` column per validator status.
+    Built with PyArrow only, so publishing works with either backend.
+    """
+    def flatten(stats: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "balance": stats["balance"],
+            "effective_balance": stats["effective_balance"],
+            "slashed": stats["slashed"],
+            **{f"status_{k}": stats["status"].get(k, 0) for k in VALIDATOR_STATUSES},
+        }
+
+    schema = pa.schema([
+        ("balance", pa.float64()),
+        ("effective_balance", pa.float64()),
+        ("slashed", pa.int64()),
+        *[(f"status_{k}", pa.int64()) for k in VALIDATOR_STATUSES],
+    ])
+    blocks_table = pa.Table.from_pylist(
+        [{"block_number": int(block), **flatten(stats)} for block, stats in blocks.items()],
+        schema=schema.insert(0, pa.field("block_number", pa.int64())),
+    ).sort_by("block_number")
+    totals_table = pa.Table.from_pylist([flatten(totals)], schema=schema)
+    return blocks_table, totals_table
+
+
+def current_generation(path: str | Path) -> int:
+    """Return the latest published generation in `path`, or 0 if none."""
+    try:
+        return int((Path(path) / GENERATION_FILE).read_text())
+    except FileNotFoundError:
+        return 0
+
+
+def _write_ipc(table: pa.Table, file_path: Path) -> None:
+    """Write an uncompressed Arrow IPC file, which readers can memory-map."""
+    with pa.OSFile(str(file_path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def publish_results(
+    blocks_table: pa.Table,
+    totals_table: pa.Table,
+    path: str | Path,
+    keep: int = PUBLISH_KEEP_GENERATIONS,
+) -> int:
+    """
+    Publish result tables as uncompressed Arrow IPC files so readers can
+    memory-map them. Point `path` at a tmpfs such as /dev/shm to keep them in
+    shared memory.
+
+    The tables of a generation are written first and the generation counter is
+    then replaced atomically, so readers never see a partial generation.
+    Older generations beyond `keep` are removed; readers that already mapped
+    them keep a valid view until they drop it.
+
+    Returns:
+        The newly published generation number.
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    generation = current_generation(path) + 1
+
+    _write_ipc(blocks_table, path / f"blocks-{generation}.arrow")
+    _write_ipc(totals_table, path / f"totals-{generation}.arrow")
+
+    tmp = path / f"{GENERATION_FILE}.tmp"
+    tmp.write_text(str(generation))
+    os.replace(tmp, path / GENERATION_FILE)
+
+    for old in path.glob("*-*.arrow"):
+        if int(old.stem.rsplit("-", 1)[1]) <= generation - keep:
+            old.unlink(missing_ok=True)
+
+    logger.info(f"Published generation {generation} to {path}")
+    return generation
+
+
+def _map_ipc(file_path: Path) -> pa.Table:
+    """Memory-map an Arrow IPC file; the table's buffers point into the mapping."""
+    with pa.memory_map(str(file_path)) as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+def read_results(path: str | Path) -> Tuple[int, pa.Table, pa.Table]:
+    """
+    Attach to the latest published generation without parsing or copying.
+    Use `polars.from_arrow` for a zero-copy DataFrame view.
+
+    Returns:
+        Tuple of (generation, blocks table, totals table).
+
+    Raises:
+        FileNotFoundError: If nothing has been published to `path` yet, or the
+            files of the current generation are missing.
+    """
+    path = Path(path)
+    generation = current_generation(path)
+    while True:
+        if generation == 0:
+            raise FileNotFoundError(f"No results published to {path}")
+        try:
+            blocks_table = _map_ipc(path / f"blocks-{generation}.arrow")
+            totals_table = _map_ipc(path / f"totals-{generation}.arrow")
+            return generation, blocks_table, totals_table
+        except FileNotFoundError:
+            # Retry only if the generation was retired between reading the counter and the files
+            latest = current_generation(path)
+            if latest == generation:
+                raise
+            generation = latest
+
+
+def wait_for_generation(
+    path: str | Path,
+    after: int,
+    timeout: float | None = None,
+    interval: float = 0.5,
+) -> Tuple[int, pa.Table, pa.Table] | None:
+    """
+    Poll until a generation newer than `after` is published, then attach to it.
+
+    Returns:
+        Same as `read_results`, or None if `timeout` seconds pass first.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while current_generation(path) <= after:
+        if deadline is not None and time.monotonic() >= deadline:
+            return None
+        time.sleep(interval)
+    return read_results(path)
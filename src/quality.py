@@ -0,0 +1,49 @@
+from typing import Any, Dict
+
+from src.logger import logger
+
+QUALITY_ACTIONS = ("fail", "warn", "ignore")
+
+
+class DataQualityError(Exception):
+    """Raised when a data-quality check configured to fail finds offending rows."""
+
+
+def quality_report(blocks: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, int]]:
+    """
+    Extract the per-block data-quality counters computed by `compute_block_stats`.
+    Returns a dict of block -> {check: offending row count}.
+    """
+    return {block: stats.get("quality", {}) for block, stats in blocks.items()}
+
+
+def apply_quality_policy(report: Dict[str, Dict[str, int]], policy: Dict[str, str]) -> None:
+    """
+    Apply a fail/warn/ignore policy to a data-quality report.
+    Checks missing from `policy` default to "warn".
+
+    Raises:
+        ValueError: If the policy contains an unknown action.
+        DataQualityError: If any check with action "fail" found offending rows.
+    """
+    failures = []
+    checks = {check for counts in report.values() for check in counts}
+
+    for check in sorted(checks):
+        action = policy.get(check, "warn")
+        if action not in QUALITY_ACTIONS:
+            raise ValueError(f"Unknown data-quality action '{action}' for check '{check}'")
+
+        offending = {block: counts[check] for block, counts in report.items() if counts.get(check)}
+        if not offending or action == "ignore":
+            continue
+
+        message = f"Data-quality check '{check}' found {sum(offending.values())} rows in blocks {sorted(offending)}"
+        if action == "fail":
+            logger.error(message)
+            failures.append(check)
+        else:
+            logger.warning(message)
+
+    if failures:
+        raise DataQualityError(f"Data-quality checks failed: {', '.join(failures)}")
@@ -46,3 +46,14 @@ def read_validators_data(batch_size: int = 1000) -> Iterator[list[Dict]]:
         if len(batch) >= batch_size:
             yield batch
             batch = []
+
+def save_parquet(table: Any, path: Path) -> None:
+    """
+    Save a Polars DataFrame or PyArrow Table as Parquet.
+    """
+    import pyarrow.parquet as pq
+
+    if hasattr(table, "to_arrow"):
+        table = table.to_arrow()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pq.write_table(table, path)
@@ -0,0 +1,102 @@
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Set
+
+from inotify_simple import INotify, flags
+
+from src.config import INPUT_DIR, INPUT_PATTERN, WATCH_DEBOUNCE_SECONDS, WATCH_MAX_DELAY_SECONDS
+from src.logger import logger
+
+# Files are picked up once fully written, either in place or renamed into the directory
+WATCH_FLAGS = flags.CLOSE_WRITE | flags.MOVED_TO
+
+# How often a blocked wait re-checks the stop event, in milliseconds
+POLL_INTERVAL_MS = 1000
+
+
+def _changed_inputs(inotify: INotify, input_dir: Path, pattern: str, timeout_ms: int) -> Set[Path]:
+    """
+    Read pending inotify events (waiting up to `timeout_ms`) and return the
+    input files they touch. A queue overflow marks every input as changed.
+    """
+    changed = set()
+    for event in inotify.read(timeout=timeout_ms):
+        if event.mask & flags.Q_OVERFLOW:
+            logger.warning("inotify queue overflowed, reprocessing all inputs")
+            changed.update(input_dir.glob(pattern))
+        elif event.name and Path(event.name).match(pattern):
+            changed.add(input_dir / event.name)
+    return changed
+
+
+def watch_inputs(
+    process: Callable[[Path], None],
+    input_dir: str | Path = INPUT_DIR,
+    pattern: str = INPUT_PATTERN,
+    debounce: float = WATCH_DEBOUNCE_SECONDS,
+    max_delay: float = WATCH_MAX_DELAY_SECONDS,
+    run_initial: bool = True,
+    stop: threading.Event | None = None,
+) -> None:
+    """
+    Watch `input_dir` with inotify and call `process(path)` for each input
+    file that changed, keeping the process (imports, thread pools, logger)
+    warm between runs.
+
+    - Coalescing: after a change, further events are absorbed until none
+      arrive for `debounce` seconds, so a burst of writes yields one run.
+      Coalescing never lasts more than `max_delay` seconds, so a file that
+      keeps being written is still processed periodically.
+    - Backpressure: runs happen one at a time on this thread; changes made
+      meanwhile stay queued in the kernel and are folded into a single
+      follow-up run per file, so runs never overlap or pile up.
+    - A failed run is logged and the watcher keeps going.
+
+    Args:
+        process: Pipeline to run for a changed input file
+        input_dir: Directory to watch
+        pattern: Glob pattern selecting input files within `input_dir`
+        debounce: Quiet period in seconds before changed files are processed
+        max_delay: Longest time in seconds a change waits while writes keep arriving
+        run_initial: Process all existing inputs once at startup
+        stop: Optional event that ends the loop when set
+    """
+    input_dir = Path(input_dir)
+    inotify = INotify()
+    inotify.add_watch(str(input_dir), WATCH_FLAGS)
+    logger.info(f"Watching {input_dir} for changes to {pattern}")
+
+    pending = set(input_dir.glob(pattern)) if run_initial else set()
+    try:
+        while stop is None or not stop.is_set():
+            if not pending:
+                pending = _changed_inputs(inotify, input_dir, pattern, POLL_INTERVAL_MS)
+                if not pending:
+                    continue
+
+            # Coalesce rapid successive changes into one run per file, bounded by max_delay
+            first_change = time.monotonic()
+            deadline = first_change + debounce
+            while (remaining := min(deadline, first_change + max_delay) - time.monotonic()) > 0:
+                more = _changed_inputs(inotify, input_dir, pattern, max(int(remaining * 1000), 1))
+                if more:
+                    pending |= more
+                    deadline = time.monotonic() + debounce
+
+            for path in sorted(pending):
+                if not path.exists():
+                    logger.warning(f"Input {path} disappeared before processing, skipping")
+                    continue
+                logger.info(f"Processing changed input {path}")
+                try:
+                    process(path)
+                except Exception:
+                    # Already logged by the pipeline; keep serving later changes
+                    logger.error(f"Processing {path} failed, waiting for the next change")
+            pending = set()
+
+    except KeyboardInterrupt:
+        logger.info("Stopping watcher")
+    finally:
+        inotify.close()
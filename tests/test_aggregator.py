@@ -1,8 +1,11 @@
 import pytest
 import polars as pl
 from src.aggregator import (
+    load_validators,
     compute_block_stats,
-    compute_totals
+    compute_totals,
+    pubkey_hex,
+    UNMAPPED_ENTITY
 )
 
 @pytest.fixture
@@ -42,3 +45,41 @@ def test_compute_totals(sample_df):
     assert result["slashed"] == 2
     assert result["status"].get("active", 0) == 2
     assert result["status"].get("pending", 0) == 1
+
+def test_load_validators_pubkey_roundtrip(tmp_path):
+    """Test pubkeys are dictionary-encoded at ingest and convert back losslessly."""
+    pubkeys = ["0x" + "ab" * 48, "0x" + "cd" * 48, "0x" + "ab" * 48]
+    path = tmp_path / "validators.jsonl"
+    pl.DataFrame({
+        "index": ["0", "1", "0"],
+        "balance": ["32000000000", "31000000000", "32000000000"],
+        "status": ["active_ongoing"] * 3,
+        "validator": pubkeys,
+        "block_number": [1, 1, 2],
+    }).write_ndjson(path)
+
+    df = load_validators(str(path)).collect()
+    assert df.schema["validator"] == pl.Categorical
+    assert df.select(pubkey_hex()).to_series().to_list() == pubkeys
+
+def test_compute_block_stats_entities(tmp_path):
+    """Test per (block, entity) aggregation through a pubkey mapping."""
+    df = pl.DataFrame({
+        "block_number": [1, 1, 1, 2],
+        "balance": [32e9, 33e9, 10e9, 32e9],
+        "status": ["active_ongoing", "exited_slashed", "active_ongoing", "active_ongoing"],
+        "validator": ["0xaa", "0xbb", "0xcc", "0xaa"],
+    }).with_columns(pl.col("validator").cast(pl.Categorical))
+    mapping_path = tmp_path / "entities.csv"
+    pl.DataFrame({"validator": ["0xaa", "0xbb"], "entity": ["lido", "lido"]}).write_csv(mapping_path)
+
+    block_stats, entity_df = compute_block_stats(df.lazy(), entity_map=mapping_path)
+    assert block_stats["1"]["balance"] == 75e9
+
+    rows = {(r["block_number"], r["entity"]): r for r in entity_df.iter_rows(named=True)}
+    assert set(rows) == {(1, "lido"), (1, UNMAPPED_ENTITY), (2, "lido")}
+    assert rows[(1, "lido")]["balance"] == 65e9
+    assert rows[(1, "lido")]["effective_balance"] == 64e9
+    assert rows[(1, "lido")]["slashed"] == 1
+    assert rows[(1, "lido")]["status_active_ongoing"] == 1
+    assert rows[(1, UNMAPPED_ENTITY)]["balance"] == 10e9
@@ -0,0 +1,75 @@
+import gzip
+import json
+import pytest
+import polars as pl
+from src.backends import get_backend
+
+@pytest.fixture
+def data_path(tmp_path):
+    """Write a small gzipped JSONL file including edge-case rows."""
+    rows = [
+        {"index": "0", "balance": "32000000000", "status": "active_ongoing", "validator": "0xaa", "block_number": 1},
+        {"index": "1", "balance": "33500000000", "status": "exited_slashed", "validator": "0xbb", "block_number": 1},
+        {"index": "1", "balance": "-5", "status": "bogus_slashed", "validator": "0xbb", "block_number": 1},
+        {"index": "2", "balance": None, "status": None, "validator": "0xcc", "block_number": 1},
+        {"index": "3", "balance": "32000000000", "status": "active_ongoing", "validator": "0xee", "block_number": None},
+        {"index": "0", "balance": "3000000000000", "status": "pending_queued", "validator": "0xaa", "block_number": 2},
+        {"index": "10000000000", "balance": "32000000000", "status": "active_ongoing", "validator": "0xdd", "block_number": 2},
+        {"index": "10000000000", "balance": "32000000000", "status": "active_ongoing", "validator": "0xdd", "block_number": 2},
+        {"index": "4", "balance": "32000000000", "status": "active_ongoing", "validator": "0xee", "block_number": None},
+        {"index": "5", "balance": "1.5", "status": "active_ongoing", "validator": "0xff", "block_number": 2},
+    ]
+    path = tmp_path / "validators_data.jsonl.gz"
+    with gzip.open(path, "wt") as f:
+        for row in rows:
+            f.write(json.dumps(row) + "\n")
+    return path
+
+def test_unknown_backend():
+    """Test selecting an unregistered backend."""
+    with pytest.raises(ValueError):
+        get_backend("pandas")
+
+def test_backends_identical(data_path, tmp_path):
+    """Test the Polars and Arrow backends produce identical results."""
+    mapping_path = tmp_path / "entities.csv"
+    pl.DataFrame({"index": [0, 1, 10**10], "entity": ["lido", "coinbase", "kraken"]}).write_csv(mapping_path)
+
+    # The small batch size spreads null block numbers over several batches
+    results = {}
+    for name, load_kwargs in (("polars", {}), ("arrow", {}), ("arrow_small", {"block_size": 256})):
+        backend = get_backend(name.removesuffix("_small"))
+        blocks, entities = backend.compute_block_stats(backend.load_validators(data_path, **load_kwargs), mapping_path)
+        results[name] = (blocks, backend.compute_totals(blocks), pl.DataFrame(entities))
+
+    polars_blocks, polars_totals, polars_entities = results["polars"]
+    for name in ("arrow", "arrow_small"):
+        arrow_blocks, arrow_totals, arrow_entities = results[name]
+        assert polars_blocks == arrow_blocks
+        assert polars_totals == arrow_totals
+        assert polars_entities.equals(arrow_entities)
+
+    assert arrow_blocks["1"]["slashed"] == 2
+    assert arrow_blocks["1"]["quality"]["duplicate_rows"] == 1
+    assert arrow_blocks["1"]["quality"]["unknown_status"] == 2
+    # Huge indices are counted without allocating by index value
+    assert arrow_blocks["2"]["quality"]["duplicate_rows"] == 1
+    # Fractional Gwei is reported instead of silently truncated away
+    assert arrow_blocks["2"]["quality"]["fractional_balance"] == 1
+    assert arrow_entities.filter(pl.col("entity") == "kraken")["status_active_ongoing"].to_list() == [2]
+    # Null block numbers are one "None" block, not a float key per batch
+    assert sorted(arrow_blocks) == ["1", "2", "None"]
+    assert arrow_blocks["None"]["status"]["active_ongoing"] == 2
+
+def test_backends_identical_pubkey_map(data_path, tmp_path):
+    """Test both backends agree when entities are keyed by validator pubkey."""
+    mapping_path = tmp_path / "entities.csv"
+    pl.DataFrame({"validator": ["0xaa", "0xdd"], "entity": ["lido", "kraken"]}).write_csv(mapping_path)
+
+    entities = {}
+    for name in ("polars", "arrow"):
+        backend = get_backend(name)
+        _, entities[name] = backend.compute_block_stats(backend.load_validators(data_path), mapping_path)
+
+    assert pl.DataFrame(entities["polars"]).equals(pl.DataFrame(entities["arrow"]))
+    assert pl.DataFrame(entities["arrow"])["entity"].to_list() == ["unmapped", "lido", "unmapped", "kraken", "lido", "unmapped"]
@@ -0,0 +1,217 @@
+import gzip
+import json
+import tempfile
+from collections import defaultdict
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+from hypothesis import HealthCheck, given, settings, strategies as st
+
+from src.backends import BACKENDS, get_backend
+from src.constants import (
+    MAX_EFFECTIVE, INCREMENT, MAX_PLAUSIBLE_BALANCE,
+    UNMAPPED_ENTITY, VALIDATOR_STATUSES
+)
+from src.utils import read_jsonl_gz
+
+# Sums of integral Gwei values are exact in float64 below this bound
+EXACT_FLOAT_LIMIT = 2**53
+
+ENTITIES = ["lido", "coinbase", "kraken"]
+
+
+def _round(exact: int | Decimal, digits: int) -> float:
+    # Round the exact value, not an intermediate float
+    return float(format(Decimal(exact), f".{digits}e"))
+
+
+def reference_stats(path: Path, entity_map: dict[int, str] | None = None) -> dict:
+    """
+    Straightforward per-row reference for compute_block_stats/compute_totals,
+    using exact integer arithmetic over read_jsonl_gz.
+    """
+    blocks: dict = {}
+    entities: dict = {}
+    for row in read_jsonl_gz(path):
+        blk = str(row["block_number"])
+        b = blocks.setdefault(blk, {
+            "balance": 0, "effective_balance": 0, "slashed": 0,
+            "status": {s: 0 for s in VALIDATOR_STATUSES},
+            "quality": defaultdict(int), "indices": [],
+        })
+        balance = None if row["balance"] is None else int(row["balance"])
+        status = row["status"]
+        effective = None if balance is None else min(balance, MAX_EFFECTIVE) // INCREMENT * INCREMENT
+        slashed = status is not None and "_slashed" in status
+
+        if balance is not None:
+            b["balance"] += balance
+            b["effective_balance"] += effective
+        b["slashed"] += slashed
+        if status in VALIDATOR_STATUSES:
+            b["status"][status] += 1
+        b["quality"]["null_balance"] += balance is None
+        b["quality"]["negative_balance"] += balance is not None and balance < 0
+        b["quality"]["excessive_balance"] += balance is not None and balance > MAX_PLAUSIBLE_BALANCE
+        b["quality"]["fractional_balance"] += 0  # balances are generated as whole Gwei
+        b["quality"]["unknown_status"] += status not in VALIDATOR_STATUSES
+        b["indices"].append(None if row["index"] is None else int(row["index"]))
+
+        if entity_map is not None:
+            index = None if row["index"] is None else int(row["index"])
+            key = (row["block_number"], entity_map.get(index, UNMAPPED_ENTITY))
+            e = entities.setdefault(key, {
+                "balance": 0, "effective_balance": 0, "slashed": 0,
+                **{f"status_{s}": 0 for s in VALIDATOR_STATUSES},
+            })
+            if balance is not None:
+                e["balance"] += balance
+                e["effective_balance"] += effective
+            e["slashed"] += slashed
+            if status in VALIDATOR_STATUSES:
+                e[f"status_{status}"] += 1
+
+    for b in blocks.values():
+        indices = b.pop("indices")
+        b["quality"]["duplicate_rows"] = len(indices) - len(set(indices))
+        b["quality"] = dict(b["quality"])
+
+    totals = {
+        "balance": sum(Decimal(_round(b["balance"], 9)) for b in blocks.values()),
+        "effective_balance": sum(Decimal(_round(b["effective_balance"], 6)) for b in blocks.values()),
+        "slashed": sum(b["slashed"] for b in blocks.values()),
+        "status": {s: sum(b["status"][s] for b in blocks.values()) for s in VALIDATOR_STATUSES},
+    }
+    return {"blocks": blocks, "totals": totals, "entities": entities}
+
+
+def assert_sum_matches(actual: float, exact: int | Decimal, digits: int | None, bound: int | Decimal) -> None:
+    """
+    Rounded sums must match the reference exactly while float64 accumulation
+    is exact; beyond that, allow one unit in the last reported digit.
+    """
+    expected = float(exact) if digits is None else _round(exact, digits)
+    if bound < EXACT_FLOAT_LIMIT:
+        assert actual == expected
+    else:
+        rel_tol = 1e-12 if digits is None else 10.0 ** -digits
+        assert actual == pytest.approx(expected, rel=rel_tol)
+
+
+balances = st.one_of(
+    st.none(),
+    st.sampled_from([
+        0, -1, INCREMENT - 1, INCREMENT, MAX_EFFECTIVE - 1, MAX_EFFECTIVE, MAX_EFFECTIVE + 1,
+        MAX_PLAUSIBLE_BALANCE, MAX_PLAUSIBLE_BALANCE + 1,
+    ]),
+    st.integers(min_value=0, max_value=40 * INCREMENT),
+    st.integers(min_value=2**53, max_value=2**56),  # huge sums, still within Int64 for 60 rows
+)
+statuses = st.one_of(
+    st.sampled_from(VALIDATOR_STATUSES),
+    st.sampled_from([None, "", "unknown", "weird_slashed"]),
+)
+# Mostly small indices so duplicates are common, plus indices far beyond any dense lookup
+indices = st.one_of(
+    st.none(),
+    st.integers(min_value=0, max_value=30),
+    st.sampled_from([10**10, 2**62]),
+)
+rows = st.fixed_dictionaries({
+    "index": indices.map(lambda i: None if i is None else str(i)),
+    "balance": balances.map(lambda b: None if b is None else str(b)),
+    "status": statuses,
+    "validator": st.integers(min_value=0, max_value=30).map(lambda i: f"0x{i:096x}"),
+    "block_number": st.sampled_from([7971487, 8071487, 8171487, None]),
+})
+# A block whose rows carry no usable data at all
+empty_block = st.lists(
+    st.fixed_dictionaries({
+        "index": st.just(None), "balance": st.just(None), "status": st.just(None),
+        "validator": st.just(None), "block_number": st.just(9971487),
+    }),
+    max_size=3,
+)
+entity_maps = st.dictionaries(indices.filter(lambda i: i is not None), st.sampled_from(ENTITIES), max_size=20)
+
+
+# Every fast path: each backend, plus the arrow backend forced across many small batches
+FAST_PATHS = [(name, {}) for name in sorted(BACKENDS)] + [("arrow", {"block_size": 1024})]
+
+
+def write_dataset(tmp: str, data: list, entity_map: dict) -> tuple[Path, Path]:
+    """Write rows as gzipped JSONL and the entity mapping as CSV."""
+    path = Path(tmp) / "validators_data.jsonl.gz"
+    with gzip.open(path, "wt") as f:
+        for row in data:
+            f.write(json.dumps(row) + "\n")
+    mapping_path = Path(tmp) / "entities.csv"
+    mapping_path.write_text("index,entity\n" + "".join(f"{i},{e}\n" for i, e in entity_map.items()))
+    return path, mapping_path
+
+
+def run_fast_path(backend_name: str, load_kwargs: dict, path: Path, mapping_path: Path) -> tuple[dict, dict, dict]:
+    """Run one fast path, returning block stats, totals and entity rows keyed by (block, entity)."""
+    backend = get_backend(backend_name)
+    blocks, entities = backend.compute_block_stats(backend.load_validators(path, **load_kwargs), mapping_path)
+    entity_rows = {
+        (row["block_number"], row["entity"]): row
+        for row in (entities.to_pylist() if hasattr(entities, "to_pylist") else entities.to_dicts())
+    }
+    return blocks, backend.compute_totals(blocks), entity_rows
+
+
+@pytest.mark.parametrize("backend_name,load_kwargs", FAST_PATHS)
+@settings(max_examples=60, deadline=None, suppress_health_check=[HealthCheck.too_slow])
+@given(data=st.lists(rows, min_size=1, max_size=60), empty=empty_block, entity_map=entity_maps)
+def test_backend_matches_reference(backend_name, load_kwargs, data, empty, entity_map):
+    """Test every fast path against the reference on randomized datasets."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path, mapping_path = write_dataset(tmp, data + empty, entity_map)
+        reference = reference_stats(path, entity_map)
+        blocks, totals, entity_rows = run_fast_path(backend_name, load_kwargs, path, mapping_path)
+
+    assert set(blocks) == set(reference["blocks"])
+    for blk, expected in reference["blocks"].items():
+        actual = blocks[blk]
+        bound = sum(abs(int(r["balance"])) for r in data + empty if r["balance"] is not None and str(r["block_number"]) == blk)
+        assert_sum_matches(actual["balance"], expected["balance"], 9, bound)
+        assert_sum_matches(actual["effective_balance"], expected["effective_balance"], 6, bound)
+        assert actual["slashed"] == expected["slashed"]
+        assert actual["status"] == expected["status"]
+        assert actual["quality"] == expected["quality"]
+
+    total_bound = sum(abs(Decimal(_round(b["balance"], 9))) for b in reference["blocks"].values())
+    assert_sum_matches(totals["balance"], reference["totals"]["balance"], 9, total_bound)
+    assert_sum_matches(totals["effective_balance"], reference["totals"]["effective_balance"], 6, total_bound)
+    assert totals["slashed"] == reference["totals"]["slashed"]
+    assert totals["status"] == reference["totals"]["status"]
+
+    assert set(entity_rows) == set(reference["entities"])
+    for key, expected in reference["entities"].items():
+        actual = entity_rows[key]
+        bound = sum(abs(int(r["balance"])) for r in data + empty if r["balance"] is not None)
+        assert_sum_matches(actual["balance"], expected["balance"], None, bound)
+        assert_sum_matches(actual["effective_balance"], expected["effective_balance"], None, bound)
+        assert {k: v for k, v in actual.items() if k.startswith("status_") or k == "slashed"} == {
+            k: v for k, v in expected.items() if k.startswith("status_") or k == "slashed"
+        }
+
+
+@settings(max_examples=60, deadline=None, suppress_health_check=[HealthCheck.too_slow])
+@given(data=st.lists(rows, min_size=1, max_size=60), empty=empty_block, entity_map=entity_maps)
+def test_fast_paths_identical(data, empty, entity_map):
+    """
+    Test all fast paths agree exactly with each other, including beyond 2**53
+    where the reference comparison has to tolerate float64 accumulation.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path, mapping_path = write_dataset(tmp, data + empty, entity_map)
+        results = [run_fast_path(name, load_kwargs, path, mapping_path) for name, load_kwargs in FAST_PATHS]
+
+    first_blocks, first_totals, first_entities = results[0]
+    for blocks, totals, entity_rows in results[1:]:
+        assert blocks == first_blocks
+        assert totals == first_totals
+        assert entity_rows == first_entities
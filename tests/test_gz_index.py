@@ -0,0 +1,74 @@
+import gzip
+import json
+import pytest
+from src.gz_index import build_index, load_index, read_rows
+
+@pytest.fixture
+def data_paths(tmp_path):
+    """Write a small gzipped JSONL file with three contiguous blocks."""
+    data_path = tmp_path / "validators_data.jsonl.gz"
+    with gzip.open(data_path, "wt") as f:
+        for block in (100, 200, 300):
+            for i in range(25):
+                f.write(json.dumps({"index": str(i), "balance": str(i), "status": "active_ongoing", "block_number": block}) + "\n")
+    return {
+        "data_path": data_path,
+        "gz_index_path": tmp_path / "validators_data.jsonl.gz.gzidx",
+        "row_index_path": tmp_path / "validators_data.jsonl.gz.rows.json",
+    }
+
+def test_build_index(data_paths):
+    """Test block starts and row counts recorded by the index."""
+    row_index = build_index(**data_paths, spacing=65536, stride=10)
+
+    assert row_index["rows"] == 75
+    assert len(row_index["checkpoints"]) == 8
+    assert row_index["blocks"]["200"] == {"row": 25, "rows": 25, "runs": [[25, 25]]}
+    assert load_index(**data_paths) == row_index
+
+def test_read_rows(data_paths):
+    """Test seeking to a block and offset returns the expected rows."""
+    build_index(**data_paths, spacing=65536, stride=10)
+
+    rows = read_rows(block=200, offset=13, n=5, **data_paths)
+    assert [r["index"] for r in rows] == ["13", "14", "15", "16", "17"]
+    assert all(r["block_number"] == 200 for r in rows)
+
+    # Reading past the end of a block continues into the next one
+    rows = read_rows(block=200, offset=24, n=2, **data_paths)
+    assert [r["block_number"] for r in rows] == [200, 300]
+
+    with pytest.raises(KeyError):
+        read_rows(block=999, **data_paths)
+
+def test_read_rows_invalid_arguments(data_paths):
+    """Test negative offsets and non-positive row counts are rejected."""
+    build_index(**data_paths, spacing=65536, stride=10)
+
+    with pytest.raises(ValueError):
+        read_rows(offset=-1, **data_paths)
+    with pytest.raises(ValueError):
+        read_rows(block=200, offset=-1, **data_paths)
+    with pytest.raises(ValueError):
+        read_rows(block=200, n=0, **data_paths)
+
+def test_read_rows_split_block(tmp_path):
+    """Test offsets into a block that reappears later map onto its later run."""
+    paths = {
+        "data_path": tmp_path / "validators_data.jsonl.gz",
+        "gz_index_path": tmp_path / "validators_data.jsonl.gz.gzidx",
+        "row_index_path": tmp_path / "validators_data.jsonl.gz.rows.json",
+    }
+    with gzip.open(paths["data_path"], "wt") as f:
+        for block, indices in ((100, range(0, 10)), (200, range(10)), (100, range(10, 20))):
+            for i in indices:
+                f.write(json.dumps({"index": str(i), "balance": str(i), "status": "active_ongoing", "block_number": block}) + "\n")
+    row_index = build_index(**paths, spacing=65536, stride=10)
+
+    assert row_index["blocks"]["100"] == {"row": 0, "rows": 20, "runs": [[0, 10], [20, 10]]}
+
+    rows = read_rows(block=100, offset=8, n=4, **paths)
+    assert [(r["block_number"], r["index"]) for r in rows] == [(100, "8"), (100, "9"), (200, "0"), (200, "1")]
+    rows = read_rows(block=100, offset=12, n=3, **paths)
+    assert [(r["block_number"], r["index"]) for r in rows] == [(100, "12"), (100, "13"), (100, "14")]
+    assert read_rows(block=100, offset=20, **paths) == []
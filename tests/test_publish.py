@@ -0,0 +1,75 @@
+import subprocess
+import sys
+import pytest
+import polars as pl
+from src.aggregator import compute_block_stats, compute_totals
+from src.publish import (
+    results_to_frames,
+    publish_results,
+    read_results,
+    current_generation,
+    wait_for_generation,
+    GENERATION_FILE
+)
+
+@pytest.fixture
+def sample_df():
+    """Create a sample DataFrame with two blocks."""
+    return pl.DataFrame({
+        "block_number": [1, 1, 2],
+        "balance": [32e9, 31e9, 32e9],
+        "status": ["active_ongoing", "exited_slashed", "active_ongoing"],
+    })
+
+def test_publish_and_read(sample_df, tmp_path):
+    """Test publishing generations and attaching to the latest one."""
+    with pytest.raises(FileNotFoundError):
+        read_results(tmp_path)
+
+    block_stats = compute_block_stats(sample_df.lazy())
+    blocks_df, totals_df = results_to_frames(block_stats, compute_totals(block_stats))
+    assert blocks_df["block_number"].to_pylist() == [1, 2]
+    assert totals_df["slashed"].to_pylist() == [1]
+
+    for expected in (1, 2, 3):
+        assert publish_results(blocks_df, totals_df, tmp_path, keep=2) == expected
+    assert current_generation(tmp_path) == 3
+    assert sorted(p.name for p in tmp_path.glob("*.arrow")) == [
+        "blocks-2.arrow", "blocks-3.arrow", "totals-2.arrow", "totals-3.arrow"
+    ]
+
+    generation, read_blocks, read_totals = read_results(tmp_path)
+    assert generation == 3
+    assert read_blocks.equals(blocks_df)
+    assert read_totals.equals(totals_df)
+
+    assert wait_for_generation(tmp_path, after=3, timeout=0.1, interval=0.01) is None
+    assert wait_for_generation(tmp_path, after=2, timeout=0.1)[0] == 3
+
+def test_read_results_missing_generation(tmp_path):
+    """Test a generation whose files are missing raises instead of retrying forever."""
+    with pytest.raises(FileNotFoundError):
+        read_results(tmp_path)
+
+    (tmp_path / GENERATION_FILE).write_text("3")
+    with pytest.raises(FileNotFoundError):
+        read_results(tmp_path)
+
+def test_publish_without_polars(tmp_path):
+    """Test the arrow backend can compute and publish results with Polars unavailable."""
+    script = f"""
+import gzip, json, sys
+sys.modules["polars"] = None  # make any Polars import fail
+from src.backends import get_backend
+from src.publish import results_to_frames, publish_results, read_results
+
+path = "{tmp_path}/validators_data.jsonl.gz"
+with gzip.open(path, "wt") as f:
+    f.write(json.dumps({{"index": "0", "balance": "32000000000", "status": "active_ongoing", "block_number": 1}}) + "\\n")
+backend = get_backend("arrow")
+blocks = backend.compute_block_stats(backend.load_validators(path))
+publish_results(*results_to_frames(blocks, backend.compute_totals(blocks)), "{tmp_path}/published")
+generation, blocks_table, _ = read_results("{tmp_path}/published")
+assert generation == 1 and blocks_table["balance"].to_pylist() == [32000000000.0]
+"""
+    subprocess.run([sys.executable, "-c", script], check=True)
@@ -0,0 +1,40 @@
+import pytest
+import polars as pl
+from src.aggregator import compute_block_stats
+from src.quality import quality_report, apply_quality_policy, DataQualityError
+
+@pytest.fixture
+def dirty_df():
+    """Create a sample DataFrame with one clean and one dirty block."""
+    return pl.DataFrame({
+        "index": [0, 1, 0, 0, 1, 2],
+        "block_number": [1, 1, 2, 2, 2, 2],
+        "balance": [32e9, 31e9, None, -5.0, 3e12, 32e9 + 0.5],
+        "status": ["active_ongoing", "exited_slashed", "active_ongoing", "active_ongoing", "bogus", None],
+    })
+
+def test_quality_counts(dirty_df):
+    """Test data-quality counters computed alongside the block metrics."""
+    report = quality_report(compute_block_stats(dirty_df.lazy()))
+
+    assert report["1"] == {
+        "null_balance": 0, "negative_balance": 0, "excessive_balance": 0,
+        "fractional_balance": 0, "unknown_status": 0, "duplicate_rows": 0,
+    }
+    assert report["2"] == {
+        "null_balance": 1, "negative_balance": 1, "excessive_balance": 1,
+        "fractional_balance": 1, "unknown_status": 2, "duplicate_rows": 1,
+    }
+
+def test_apply_quality_policy(dirty_df):
+    """Test fail/warn/ignore handling of the report."""
+    report = quality_report(compute_block_stats(dirty_df.lazy()))
+    checks = report["2"].keys()
+
+    apply_quality_policy(report, {check: "warn" for check in checks})
+    apply_quality_policy(report, {check: "ignore" for check in checks})
+
+    with pytest.raises(DataQualityError, match="duplicate_rows"):
+        apply_quality_policy(report, {"duplicate_rows": "fail"})
+    with pytest.raises(ValueError):
+        apply_quality_policy(report, {"duplicate_rows": "explode"})
@@ -0,0 +1,79 @@
+import os
+import threading
+import time
+from src.watch import watch_inputs
+
+class Recorder:
+    """Record processed inputs and let the test wait until enough runs happened."""
+
+    def __init__(self, fail_on=()):
+        self.calls = []
+        self.fail_on = set(fail_on)
+        self.changed = threading.Condition()
+
+    def __call__(self, path):
+        with self.changed:
+            self.calls.append(path.name)
+            self.changed.notify_all()
+        if path.name in self.fail_on:
+            raise ValueError("bad input")
+
+    def wait_for(self, n, timeout=5.0):
+        with self.changed:
+            return self.changed.wait_for(lambda: len(self.calls) >= n, timeout=timeout)
+
+def start_watcher(tmp_path, process, **kwargs):
+    stop = threading.Event()
+    thread = threading.Thread(
+        target=watch_inputs,
+        kwargs={"process": process, "input_dir": tmp_path, "stop": stop, **kwargs},
+    )
+    thread.start()
+    return thread, stop
+
+def stop_watcher(thread, stop, tmp_path):
+    stop.set()
+    # Wake the watcher's blocking inotify read instead of waiting out its poll interval
+    (tmp_path / "wake.tmp").write_bytes(b"")
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+
+def test_watch_inputs_coalesces_changes(tmp_path):
+    """Test bursts of changes to one input yield a single run, ignoring other files."""
+    (tmp_path / "seed.jsonl.gz").write_bytes(b"x")
+    process = Recorder(fail_on={"bad.jsonl.gz"})
+    thread, stop = start_watcher(tmp_path, process, debounce=0.2)
+
+    # The initial run happens after the watch is registered, so later writes are seen
+    assert process.wait_for(1)
+
+    # A burst of writes, a sidecar file and a renamed-in input
+    for _ in range(5):
+        (tmp_path / "validators_data.jsonl.gz").write_bytes(b"x")
+        (tmp_path / "validators_data.jsonl.gz.gzidx").write_bytes(b"x")
+    (tmp_path / "bad.tmp").write_bytes(b"x")
+    os.replace(tmp_path / "bad.tmp", tmp_path / "bad.jsonl.gz")
+    assert process.wait_for(3)
+
+    # A failed run does not stop the watcher; a split burst would show up as an extra run here
+    (tmp_path / "other.jsonl.gz").write_bytes(b"y")
+    assert process.wait_for(4)
+
+    stop_watcher(thread, stop, tmp_path)
+    assert process.calls == ["seed.jsonl.gz", "bad.jsonl.gz", "validators_data.jsonl.gz", "other.jsonl.gz"]
+
+def test_watch_inputs_bounds_coalescing(tmp_path):
+    """Test a file written continuously is still processed after max_delay."""
+    process = Recorder()
+    thread, stop = start_watcher(tmp_path, process, debounce=0.2, max_delay=0.5, run_initial=False)
+
+    # Keep writing faster than the debounce period until a run happens
+    deadline = time.monotonic() + 5.0
+    while not process.calls and time.monotonic() < deadline:
+        (tmp_path / "validators_data.jsonl.gz").write_bytes(b"x")
+        process.wait_for(1, timeout=0.05)
+    processed_while_writing = bool(process.calls)
+
+    stop_watcher(thread, stop, tmp_path)
+    assert processed_while_writing
+    assert process.calls[:1] == ["validators_data.jsonl.gz"]